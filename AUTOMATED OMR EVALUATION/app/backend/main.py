@@ -4,7 +4,7 @@ Provides REST API endpoints for file upload, processing, and data management
 """
 from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 import os
@@ -14,6 +14,7 @@ from datetime import datetime
 import json
 import pandas as pd
 from io import BytesIO
+import orjson
 
 from ..database.database import get_db, init_database
 from ..database.models import Student, Exam, ExamResult, AuditLog, ProcessingQueue
@@ -22,11 +23,19 @@ from ..core.omr_processor import OMRProcessor
 from .schemas import *
 from .utils import *
 
+class NumpyORJSONResponse(ORJSONResponse):
+    """orjson response that also accepts NumPy scalars/arrays and non-string dict keys"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="OMR Evaluation System API",
     description="Automated OMR sheet evaluation and scoring system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=NumpyORJSONResponse
 )
 
 # Add CORS middleware
@@ -59,6 +68,12 @@ async def startup_event():
         omr_processor.load_answer_keys(answer_keys_file)
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Finish pending result image writes before the server exits"""
+    omr_processor.close()
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -86,7 +101,7 @@ async def create_student(student: StudentCreate, db: Session = Depends(get_db)):
 async def get_students(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get list of students"""
     students = StudentCRUD.get_students(db, skip=skip, limit=limit)
-    return students
+    return [StudentResponse.from_orm_fast(s) for s in students]
 
 
 @app.get("/students/{student_id}", response_model=StudentResponse)
@@ -95,7 +110,7 @@ async def get_student(student_id: int, db: Session = Depends(get_db)):
     student = StudentCRUD.get_student(db, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    return student
+    return StudentResponse.from_orm_fast(student)
 
 
 # Exam management endpoints
@@ -118,7 +133,7 @@ async def create_exam(exam: ExamCreate, db: Session = Depends(get_db)):
 async def get_exams(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get list of exams"""
     exams = ExamCRUD.get_exams(db, skip=skip, limit=limit)
-    return exams
+    return [ExamResponse.from_orm_fast(e) for e in exams]
 
 
 @app.get("/exams/{exam_id}", response_model=ExamResponse)
@@ -127,7 +142,7 @@ async def get_exam(exam_id: int, db: Session = Depends(get_db)):
     exam = ExamCRUD.get_exam(db, exam_id)
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
-    return exam
+    return ExamResponse.from_orm_fast(exam)
 
 
 @app.get("/exams/{exam_id}/statistics")
@@ -291,14 +306,14 @@ async def get_queue_item_status(queue_id: int, db: Session = Depends(get_db)):
 async def get_exam_results(exam_id: int, db: Session = Depends(get_db)):
     """Get all results for an exam"""
     results = ExamResultCRUD.get_results_by_exam(db, exam_id)
-    return results
+    return [ExamResultResponse.model_validate(r) for r in results]
 
 
 @app.get("/results/student/{student_id}", response_model=List[ExamResultResponse])
 async def get_student_results(student_id: int, db: Session = Depends(get_db)):
     """Get all results for a student"""
     results = ExamResultCRUD.get_results_by_student(db, student_id)
-    return results
+    return [ExamResultResponse.model_validate(r) for r in results]
 
 
 @app.get("/results/flagged")
@@ -314,7 +329,7 @@ async def get_result(result_id: int, db: Session = Depends(get_db)):
     result = ExamResultCRUD.get_result(db, result_id)
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
-    return result
+    return ExamResultResponse.model_validate(result)
 
 
 # Export endpoints
@@ -1,11 +1,41 @@
 """
 Pydantic schemas for API request/response models
 """
-from pydantic import BaseModel, validator
-from typing import Optional, Dict, List, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Optional, Dict, List, Any, Literal
+from typing_extensions import Annotated
 from datetime import datetime
 
 
+# Answer key types (validated by pydantic-core, no per-item Python loop)
+Answer = Literal['A', 'B', 'C', 'D']
+QuestionNumber = Annotated[str, StringConstraints(pattern=r'^(?:[1-9]|[1-9][0-9]|100)$')]
+AnswerKey = Annotated[Dict[QuestionNumber, Answer], Field(min_length=100, max_length=100)]
+
+
+# Shared config for response models read from ORM rows
+ORM_MODEL_CONFIG = ConfigDict(
+    from_attributes=True,
+    revalidate_instances='never',
+    extra='ignore',
+    validate_assignment=False
+)
+
+
+class FastFromORM:
+    """Build response models from trusted ORM rows without running validators"""
+    
+    @classmethod
+    def from_orm_fast(cls, obj):
+        """Construct the model directly from an ORM row (data is DB-trusted)"""
+        values = {}
+        for name in cls.model_fields:
+            if not hasattr(obj, name):
+                continue  # Leave the field default in place
+            values[name] = getattr(obj, name)
+        return cls.model_construct(**values)
+
+
 # Student schemas
 class StudentBase(BaseModel):
     student_id: str
@@ -26,13 +56,12 @@ class StudentUpdate(BaseModel):
     batch: Optional[str] = None
 
 
-class StudentResponse(StudentBase):
+class StudentResponse(FastFromORM, StudentBase):
     id: int
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # Exam schemas
@@ -43,18 +72,7 @@ class ExamBase(BaseModel):
     subjects: List[str] = ["Mathematics", "Physics", "Chemistry", "Biology", "English"]
     questions_per_subject: int = 20
     sheet_versions: List[str] = ["A", "B", "C", "D"]
-    answer_keys: Dict[str, Dict[str, str]]  # version -> question_number -> correct_answer
-    
-    @validator('answer_keys')
-    def validate_answer_keys(cls, v):
-        """Validate answer keys format"""
-        for version, answers in v.items():
-            if len(answers) != 100:
-                raise ValueError(f"Answer key for version {version} must have exactly 100 answers")
-            for q_num, answer in answers.items():
-                if answer not in ['A', 'B', 'C', 'D']:
-                    raise ValueError(f"Invalid answer '{answer}' for question {q_num}")
-        return v
+    answer_keys: Dict[str, AnswerKey]  # version -> question_number -> correct_answer
 
 
 class ExamCreate(ExamBase):
@@ -64,16 +82,15 @@ class ExamCreate(ExamBase):
 class ExamUpdate(BaseModel):
     exam_name: Optional[str] = None
     exam_date: Optional[datetime] = None
-    answer_keys: Optional[Dict[str, Dict[str, str]]] = None
+    answer_keys: Optional[Dict[str, AnswerKey]] = None
 
 
-class ExamResponse(ExamBase):
+class ExamResponse(FastFromORM, ExamBase):
     id: int
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # Exam Result schemas
@@ -103,6 +120,8 @@ class ExamResultUpdate(BaseModel):
     flagged_questions: Optional[List[str]] = None
 
 
+# Validated from ORM rows rather than constructed: scores are stored as Float
+# and need coercing to int, and the JSON columns may hold NULLs
 class ExamResultResponse(ExamResultBase):
     id: int
     student_id: Optional[int] = None
@@ -115,12 +134,11 @@ class ExamResultResponse(ExamResultBase):
     student: Optional[StudentResponse] = None
     exam: Optional[ExamResponse] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # Processing Queue schemas
-class ProcessingQueueResponse(BaseModel):
+class ProcessingQueueResponse(FastFromORM, BaseModel):
     id: int
     exam_id: Optional[int] = None
     file_path: str
@@ -131,12 +149,11 @@ class ProcessingQueueResponse(BaseModel):
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # Audit Log schemas
-class AuditLogResponse(BaseModel):
+class AuditLogResponse(FastFromORM, BaseModel):
     id: int
     exam_id: Optional[int] = None
     result_id: Optional[int] = None
@@ -151,8 +168,7 @@ class AuditLogResponse(BaseModel):
     skew_correction: Optional[float] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 # File upload schemas
@@ -192,7 +208,7 @@ class ExamStatistics(BaseModel):
 
 
 # Configuration schemas
-class SystemConfigResponse(BaseModel):
+class SystemConfigResponse(FastFromORM, BaseModel):
     id: int
     config_key: str
     config_value: str
@@ -200,8 +216,7 @@ class SystemConfigResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
 
 
 class SystemConfigUpdate(BaseModel):
@@ -212,7 +227,7 @@ class SystemConfigUpdate(BaseModel):
 class ErrorResponse(BaseModel):
     detail: str
     error_code: Optional[str] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
 # Health check schema
@@ -227,26 +242,7 @@ class HealthResponse(BaseModel):
 # Answer key validation schema
 class AnswerKeyValidation(BaseModel):
     version: str
-    answers: Dict[str, str]
-    
-    @validator('answers')
-    def validate_answers(cls, v):
-        """Validate answer format"""
-        if len(v) != 100:
-            raise ValueError("Answer key must have exactly 100 answers")
-        
-        for q_num, answer in v.items():
-            try:
-                q_int = int(q_num)
-                if q_int < 1 or q_int > 100:
-                    raise ValueError(f"Question number {q_num} out of range (1-100)")
-            except ValueError:
-                raise ValueError(f"Invalid question number format: {q_num}")
-            
-            if answer not in ['A', 'B', 'C', 'D']:
-                raise ValueError(f"Invalid answer '{answer}' for question {q_num}")
-        
-        return v
+    answers: AnswerKey
 
 
 # Bulk processing schemas
@@ -2,14 +2,19 @@
 Utility functions for the FastAPI backend
 """
 import os
+import sys
 import mimetypes
-from typing import List, Dict, Any, Optional
-import hashlib
+from typing import List, Dict, Any, Optional, FrozenSet, Tuple
+from functools import lru_cache
 from datetime import datetime, timedelta
 import json
+import math
 import cv2
 import numpy as np
 from PIL import Image
+import blake3
+
+from ..core.scoring_kernel import UNANSWERED_CODE, encode_answers
 
 
 # File handling utilities
@@ -17,13 +22,13 @@ ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.pdf'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 
 
+@lru_cache(maxsize=1024)
 def is_valid_file_type(filename: str) -> bool:
     """Check if file type is allowed"""
     if not filename:
         return False
     
-    ext = get_file_extension(filename).lower()
-    return ext in ALLOWED_EXTENSIONS
+    return get_file_extension(filename) in ALLOWED_EXTENSIONS
 
 
 def get_file_extension(filename: str) -> str:
@@ -32,13 +37,10 @@ def get_file_extension(filename: str) -> str:
 
 
 def get_file_hash(file_path: str) -> str:
-    """Generate MD5 hash of file for duplicate detection"""
-    hash_md5 = hashlib.md5()
+    """Generate BLAKE3 hash of file for duplicate detection"""
     try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        # blake3 maps the file itself and hashes it with its SIMD pipeline
+        return blake3.blake3().update_mmap(file_path).hexdigest()
     except Exception:
         return ""
 
@@ -55,7 +57,8 @@ def validate_file_size(file_path: str) -> bool:
 def get_image_info(file_path: str) -> Dict[str, Any]:
     """Get basic image information"""
     try:
-        if file_path.lower().endswith('.pdf'):
+        ext = get_file_extension(file_path)
+        if ext == '.pdf':
             # For PDF files, we'll need to convert first page to image
             return {
                 "format": "PDF",
@@ -65,27 +68,29 @@ def get_image_info(file_path: str) -> Dict[str, Any]:
                 "size_bytes": os.path.getsize(file_path)
             }
         else:
-            # For image files
-            image = cv2.imread(file_path)
-            if image is not None:
-                height, width, channels = image.shape
-                return {
-                    "format": get_file_extension(file_path).upper().replace('.', ''),
-                    "width": width,
-                    "height": height,
-                    "channels": channels,
-                    "size_bytes": os.path.getsize(file_path)
-                }
-            else:
-                # Try with PIL as fallback
+            # For image files, PIL reads the header only (no pixel decode)
+            try:
                 with Image.open(file_path) as img:
                     return {
-                        "format": img.format,
+                        "format": ext[1:].upper(),
                         "width": img.width,
                         "height": img.height,
-                        "channels": len(img.getbands()) if hasattr(img, 'getbands') else 1,
+                        "channels": len(img.getbands()),
                         "size_bytes": os.path.getsize(file_path)
                     }
+            except Exception:
+                # Fall back to a full OpenCV decode
+                image = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
+                if image is None:
+                    raise ValueError("Could not load image")
+                height, width = image.shape[:2]
+                return {
+                    "format": ext[1:].upper(),
+                    "width": width,
+                    "height": height,
+                    "channels": image.shape[2] if image.ndim == 3 else 1,
+                    "size_bytes": os.path.getsize(file_path)
+                }
     except Exception as e:
         return {
             "format": "Unknown",
@@ -98,6 +103,20 @@ def get_image_info(file_path: str) -> Dict[str, Any]:
 
 
 # Answer key utilities
+# Interned question number keys "1".."100", shared by all lookups
+Q_KEYS = tuple(sys.intern(str(i)) for i in range(1, 101))
+_VALID_ANSWERS = frozenset('ABCD')
+_EXPECTED_Q = frozenset(Q_KEYS)
+
+
+@lru_cache(maxsize=32)
+def _make_key_checker(total_questions: int) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Return (valid answers, expected question numbers) for an answer key size"""
+    if total_questions == 100:
+        return _VALID_ANSWERS, _EXPECTED_Q
+    return _VALID_ANSWERS, frozenset(sys.intern(str(i)) for i in range(1, total_questions + 1))
+
+
 def validate_answer_key(answer_key: Dict[str, str], total_questions: int = 100) -> Dict[str, Any]:
     """Validate answer key format and content"""
     errors = []
@@ -107,8 +126,9 @@ def validate_answer_key(answer_key: Dict[str, str], total_questions: int = 100)
     if len(answer_key) != total_questions:
         errors.append(f"Expected {total_questions} answers, got {len(answer_key)}")
     
-    # Check question numbering and answer format
-    valid_answers = {'A', 'B', 'C', 'D'}
+    # Check question numbering and answer format, counting answers as we go
+    valid_answers, expected_questions = _make_key_checker(total_questions)
+    answer_counts = {}
     for q_num, answer in answer_key.items():
         try:
             q_int = int(q_num)
@@ -117,23 +137,18 @@ def validate_answer_key(answer_key: Dict[str, str], total_questions: int = 100)
         except ValueError:
             errors.append(f"Invalid question number format: {q_num}")
         
-        if answer not in valid_answers:
+        if answer in valid_answers:
+            answer_counts[answer] = answer_counts.get(answer, 0) + 1
+        else:
             errors.append(f"Invalid answer '{answer}' for question {q_num}. Must be A, B, C, or D")
     
     # Check for missing questions
-    expected_questions = set(str(i) for i in range(1, total_questions + 1))
-    provided_questions = set(answer_key.keys())
-    missing_questions = expected_questions - provided_questions
+    missing_questions = expected_questions - answer_key.keys()
     
     if missing_questions:
         errors.append(f"Missing answers for questions: {sorted(missing_questions, key=int)}")
     
     # Check answer distribution (warning if too skewed)
-    answer_counts = {}
-    for answer in answer_key.values():
-        if answer in valid_answers:
-            answer_counts[answer] = answer_counts.get(answer, 0) + 1
-    
     if answer_counts:
         total_valid = sum(answer_counts.values())
         for answer, count in answer_counts.items():
@@ -155,7 +170,9 @@ def validate_answer_key(answer_key: Dict[str, str], total_questions: int = 100)
 def compare_answer_keys(key1: Dict[str, str], key2: Dict[str, str]) -> Dict[str, Any]:
     """Compare two answer keys and find differences"""
     differences = []
-    common_questions = set(key1.keys()) & set(key2.keys())
+    keys1 = key1.keys()
+    keys2 = key2.keys()
+    common_questions = keys1 & keys2
     
     for q_num in sorted(common_questions, key=int):
         if key1[q_num] != key2[q_num]:
@@ -165,8 +182,8 @@ def compare_answer_keys(key1: Dict[str, str], key2: Dict[str, str]) -> Dict[str,
                 "key2_answer": key2[q_num]
             })
     
-    only_in_key1 = set(key1.keys()) - set(key2.keys())
-    only_in_key2 = set(key2.keys()) - set(key1.keys())
+    only_in_key1 = keys1 - keys2
+    only_in_key2 = keys2 - keys1
     
     return {
         "total_differences": len(differences),
@@ -186,35 +203,28 @@ def calculate_subject_scores(student_answers: Dict[str, str],
     if subjects is None:
         subjects = ["Mathematics", "Physics", "Chemistry", "Biology", "English"]
     
-    subject_scores = {}
-    total_score = 0
-    total_correct = 0
-    total_questions = 0
+    # Questions count towards a subject only when present in both dicts
+    common_keys = student_answers.keys() & correct_answers.keys()
+    total_questions = len(subjects) * questions_per_subject
+    student_codes = encode_answers(student_answers, total_questions, UNANSWERED_CODE, common_keys)
+    correct_codes = encode_answers(correct_answers, total_questions, questions=common_keys)
     
-    for i, subject in enumerate(subjects):
-        start_q = i * questions_per_subject + 1
-        end_q = (i + 1) * questions_per_subject
-        
-        correct_count = 0
-        subject_total = 0
-        
-        for q_num in range(start_q, end_q + 1):
-            q_str = str(q_num)
-            if q_str in student_answers and q_str in correct_answers:
-                subject_total += 1
-                if student_answers[q_str] == correct_answers[q_str]:
-                    correct_count += 1
-        
+    shape = (len(subjects), questions_per_subject)
+    answered = (student_codes != 0).reshape(shape)
+    matches = answered & (student_codes == correct_codes).reshape(shape)
+    subject_totals = answered.sum(axis=1).tolist()
+    subject_correct = matches.sum(axis=1).tolist()
+    
+    subject_scores = {}
+    for subject, correct_count, subject_total in zip(subjects, subject_correct, subject_totals):
         subject_scores[subject] = {
             "score": correct_count,
             "total": subject_total,
             "percentage": (correct_count / subject_total * 100) if subject_total > 0 else 0
         }
-        
-        total_correct += correct_count
-        total_questions += subject_total
     
-    total_score = total_correct
+    total_score = sum(subject_correct)
+    total_questions = sum(subject_totals)
     
     return {
         "subject_scores": subject_scores,
@@ -228,19 +238,14 @@ def identify_flagged_questions(student_answers: Dict[str, str],
                              confidence_scores: Dict[str, float],
                              confidence_threshold: float = 0.8) -> List[str]:
     """Identify questions that need manual review"""
-    flagged = []
-    
-    for q_num, confidence in confidence_scores.items():
-        if confidence < confidence_threshold:
-            flagged.append(q_num)
+    low_confidence = {q_num for q_num, confidence in confidence_scores.items()
+                      if confidence < confidence_threshold}
     
     # Also flag questions with no detected answer
-    for q_num in range(1, 101):
-        q_str = str(q_num)
-        if q_str not in student_answers or student_answers[q_str] == "":
-            flagged.append(q_str)
+    answered = {q_num for q_num, answer in student_answers.items() if answer != ""}
+    no_answer = _EXPECTED_Q - answered
     
-    return sorted(set(flagged), key=int)
+    return sorted(low_confidence | no_answer, key=int)
 
 
 # Statistics utilities
@@ -249,23 +254,20 @@ def calculate_score_distribution(scores: List[int], bins: int = 10) -> Dict[str,
     if not scores:
         return {}
     
-    min_score = min(scores)
-    max_score = max(scores)
+    scores_arr = np.asarray(scores)
+    min_score = scores_arr.min()
+    max_score = scores_arr.max()
     bin_size = (max_score - min_score) / bins if max_score > min_score else 1
     
+    # Bins are [start, end) except the last, which includes the max value
+    edges = min_score + np.arange(bins + 1) * bin_size
+    counts, _ = np.histogram(scores_arr, bins=edges)
+    
     distribution = {}
-    for i in range(bins):
-        bin_start = min_score + i * bin_size
-        bin_end = min_score + (i + 1) * bin_size
-        
-        if i == bins - 1:  # Last bin includes max value
-            bin_label = f"{int(bin_start)}-{int(bin_end)}"
-            count = sum(1 for score in scores if bin_start <= score <= bin_end)
-        else:
-            bin_label = f"{int(bin_start)}-{int(bin_end-1)}"
-            count = sum(1 for score in scores if bin_start <= score < bin_end)
-        
-        distribution[bin_label] = count
+    for i, count in enumerate(counts.tolist()):
+        bin_start = edges[i]
+        bin_end = edges[i + 1] if i == bins - 1 else edges[i + 1] - 1
+        distribution[f"{int(bin_start)}-{int(bin_end)}"] = count
     
     return distribution
 
@@ -285,16 +287,14 @@ def cleanup_old_files(directory: str, max_age_days: int = 7) -> int:
     if not os.path.exists(directory):
         return 0
     
-    cutoff_time = datetime.now() - timedelta(days=max_age_days)
+    cutoff_ts = (datetime.now() - timedelta(days=max_age_days)).timestamp()
     deleted_count = 0
     
     try:
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
-            if os.path.isfile(file_path):
-                file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                if file_time < cutoff_time:
-                    os.remove(file_path)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.stat().st_mtime < cutoff_ts:
+                    os.remove(entry.path)
                     deleted_count += 1
     except Exception as e:
         print(f"Error during cleanup: {e}")
@@ -361,31 +361,38 @@ def validate_exam_name(exam_name: str) -> Dict[str, Any]:
 
 
 # Image processing utilities
+NOISE_KERNEL = np.array([[1, -2, 1],
+                         [-2, 4, -2],
+                         [1, -2, 1]], dtype=np.int16)
+
+
 def get_image_quality_metrics(image_path: str) -> Dict[str, Any]:
     """Calculate basic image quality metrics"""
     try:
-        image = cv2.imread(image_path)
-        if image is None:
+        # Decode straight to grayscale for analysis
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             return {"error": "Could not load image"}
         
-        # Convert to grayscale for analysis
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
         # Calculate metrics
         height, width = gray.shape
         
-        # Brightness (mean intensity)
-        brightness = np.mean(gray)
+        # Brightness (mean intensity) and contrast (standard deviation) in one pass
+        mean, std = cv2.meanStdDev(gray)
+        brightness = mean[0, 0]
+        contrast = std[0, 0]
         
-        # Contrast (standard deviation)
-        contrast = np.std(gray)
+        # Sharpness (Laplacian variance); int16 output keeps the filter on the integer SIMD path
+        laplacian = cv2.Laplacian(gray, cv2.CV_16S)
+        sharpness = cv2.meanStdDev(laplacian)[1][0, 0] ** 2
         
-        # Sharpness (Laplacian variance)
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-        sharpness = laplacian.var()
-        
-        # Noise estimation (using high-frequency content)
-        noise = np.std(cv2.GaussianBlur(gray, (5, 5), 0) - gray)
+        # Noise estimation (Immerkaer's fast noise sigma estimate), kernel response fits in int16;
+        # images without an interior pixel have no response to measure
+        if min(height, width) < 3:
+            noise = 0.0
+        else:
+            noise_response = cv2.filter2D(gray, cv2.CV_16S, NOISE_KERNEL)[1:-1, 1:-1]
+            noise = cv2.norm(noise_response, cv2.NORM_L1) * math.sqrt(0.5 * math.pi) / (6 * (width - 2) * (height - 2))
         
         return {
             "width": width,
@@ -394,7 +401,7 @@ def get_image_quality_metrics(image_path: str) -> Dict[str, Any]:
             "contrast": float(contrast),
             "sharpness": float(sharpness),
             "noise": float(noise),
-            "quality_score": min(100, max(0, (sharpness / 100) * (contrast / 50) * 100))
+            "quality_score": float(min(100, max(0, (sharpness / 100) * (contrast / 50) * 100)))
         }
         
     except Exception as e:
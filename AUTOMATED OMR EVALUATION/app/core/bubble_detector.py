@@ -11,6 +11,14 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 import joblib
 import os
+import sys
+
+
+# Interned answer keys "Q1".."Q100", shared by all processed sheets
+QUESTION_KEYS = tuple(sys.intern(f"Q{i}") for i in range(1, 101))
+
+# Bubbles classified below this confidence are counted as low confidence
+LOW_CONFIDENCE_THRESHOLD = 0.7
 
 
 class BubbleDetector:
@@ -287,6 +295,7 @@ class BubbleDetector:
             "grid_structure": None,
             "classifications": [],
             "confidence_scores": [],
+            "confidence_summary": {},
             "processing_info": {}
         }
         
@@ -317,6 +326,11 @@ class BubbleDetector:
             classifications = []
             confidence_scores = []
             filled_count = 0
+            # Confidence summary accumulated alongside classification
+            confidence_sum = 0.0
+            min_confidence = math.inf
+            max_confidence = -math.inf
+            low_confidence_count = 0
             
             for bubble in bubbles:
                 is_filled, confidence = self.classify_bubble(image, bubble)
@@ -325,11 +339,24 @@ class BubbleDetector:
                 
                 if is_filled:
                     filled_count += 1
+                
+                confidence_sum += confidence
+                min_confidence = min(min_confidence, confidence)
+                max_confidence = max(max_confidence, confidence)
+                if confidence < LOW_CONFIDENCE_THRESHOLD:
+                    low_confidence_count += 1
             
+            average_confidence = confidence_sum / len(bubbles)
             results["bubbles_filled"] = filled_count
             results["classifications"] = classifications
             results["confidence_scores"] = confidence_scores
-            results["processing_info"]["average_confidence"] = np.mean(confidence_scores) if confidence_scores else 0
+            results["confidence_summary"] = {
+                "average_confidence": float(average_confidence),
+                "min_confidence": float(min_confidence),
+                "max_confidence": float(max_confidence),
+                "low_confidence_count": low_confidence_count
+            }
+            results["processing_info"]["average_confidence"] = average_confidence
             
             return results
             
@@ -373,10 +400,14 @@ class BubbleDetector:
                             filled_options.append(chr(ord('A') + j))  # A, B, C, D
                     
                     mapping_info["total_questions"] += 1
+                    if question_num <= len(QUESTION_KEYS):
+                        question_key = QUESTION_KEYS[question_num - 1]
+                    else:
+                        question_key = f"Q{question_num}"
                     
                     if len(filled_options) == 0:
                         # No answer selected
-                        answers[f"Q{question_num}"] = None
+                        answers[question_key] = None
                         flagged_questions.append({
                             "question": question_num,
                             "issue": "no_answer",
@@ -386,12 +417,12 @@ class BubbleDetector:
                         
                     elif len(filled_options) == 1:
                         # Single answer (normal case)
-                        answers[f"Q{question_num}"] = filled_options[0]
+                        answers[question_key] = filled_options[0]
                         mapping_info["answered_questions"] += 1
                         
                     else:
                         # Multiple answers (ambiguous)
-                        answers[f"Q{question_num}"] = filled_options
+                        answers[question_key] = filled_options
                         flagged_questions.append({
                             "question": question_num,
                             "issue": "multiple_answers",
@@ -240,8 +240,13 @@ class ImageProcessor:
         
         return binary
     
-    def preprocess_image(self, image_path: str) -> Tuple[np.ndarray, dict]:
-        """Complete preprocessing pipeline for OMR sheet"""
+    def preprocess_image(self, image_path: str, return_original: bool = False):
+        """
+        Complete preprocessing pipeline for OMR sheet
+        
+        Returns (processed_image, processing_info), or
+        (processed_image, processing_info, original_image) when return_original is set
+        """
         processing_info = {
             "original_size": None,
             "final_size": None,
@@ -253,7 +258,7 @@ class ImageProcessor:
         
         try:
             # Load image
-            image = self.load_image(image_path)
+            original = image = self.load_image(image_path)
             processing_info["original_size"] = image.shape[:2]
             processing_info["processing_steps"].append("loaded")
             
@@ -298,6 +303,8 @@ class ImageProcessor:
             
             processing_info["final_size"] = binary.shape[:2]
             
+            if return_original:
+                return binary, processing_info, original
             return binary, processing_info
             
         except Exception as e:
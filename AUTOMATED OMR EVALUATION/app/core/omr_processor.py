@@ -3,14 +3,51 @@ Main OMR processing module that orchestrates the complete evaluation pipeline
 """
 import cv2
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Iterator
 import json
 import os
+import copy
+import hashlib
+import threading
+import multiprocessing
+from collections import Counter, OrderedDict
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 import logging
 
 from .image_processor import ImageProcessor
-from .bubble_detector import BubbleDetector
+from .bubble_detector import BubbleDetector, QUESTION_KEYS
+from .scoring_kernel import UNANSWERED_CODE, bulk_score, encode_answers, score_sheet
+
+
+# Unit circle used to approximate bubble outlines as polygons
+_CIRCLE_POINTS = 16
+_UNIT_CIRCLE = np.stack([
+    np.cos(np.linspace(0, 2 * np.pi, _CIRCLE_POINTS, endpoint=False)),
+    np.sin(np.linspace(0, 2 * np.pi, _CIRCLE_POINTS, endpoint=False))
+], axis=-1)
+
+# Maximum number of processed images whose detection results are memoized
+IMAGE_CACHE_SIZE = 256
+
+# Number of processed sheets scored together by the bulk scoring kernel
+SCORE_BATCH_SIZE = 64
+
+# Encoder settings for saved result images, keyed by file suffix
+_IMWRITE_PARAMS = {
+    ".jpg": [cv2.IMWRITE_JPEG_QUALITY, 85],
+    ".jpeg": [cv2.IMWRITE_JPEG_QUALITY, 85],
+    ".png": [cv2.IMWRITE_PNG_COMPRESSION, 1],
+}
+
+
+def circle_polygons(circles: np.ndarray) -> List[np.ndarray]:
+    """Convert an (N, 3) array of (x, y, r) circles to closed int32 polygons"""
+    centers = circles[:, None, :2].astype(np.float32)
+    radii = circles[:, None, 2:3].astype(np.float32)
+    points = np.rint(centers + radii * _UNIT_CIRCLE).astype(np.int32)
+    return list(points)
 
 
 class OMRProcessor:
@@ -20,19 +57,56 @@ class OMRProcessor:
         self.image_processor = ImageProcessor()
         self.bubble_detector = BubbleDetector()
         self.answer_keys = {}
+        self._encoded_keys = {}  # sheet_version -> encoded answer key
+        self._version_cache: "OrderedDict[bytes, str]" = OrderedDict()  # image hash -> sheet version
+        self._bubble_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()  # image hash -> bubble results
+        self._overlay_cache: "OrderedDict[bytes, Tuple]" = OrderedDict()  # image hash -> overlay shapes
+        self._cache_lock = threading.Lock()  # guards the caches above; batch threads share them
         self.subject_config = {
             "subjects": ["Mathematics", "Physics", "Chemistry", "Biology", "English"],
             "questions_per_subject": 20,
             "total_questions": 100
         }
+        self._build_subject_tables()
+        
+        # Image encoding releases the GIL, so result images are written in the background
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
+    def close(self):
+        """Wait for pending image writes and shut down the IO pool"""
+        self._io_pool.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _build_subject_tables(self):
+        """Precompute question -> subject lookups for the current subject config"""
+        subjects = self.subject_config["subjects"]
+        questions_per_subject = self.subject_config["questions_per_subject"]
+        
+        # Subject index for each question (question_num - 1)
+        self._q2s = np.repeat(np.arange(len(subjects)), questions_per_subject)
+        self._breakdown_template = {
+            subject: {"correct": 0, "total": questions_per_subject, "percentage": 0}
+            for subject in subjects
+        }
+        # Re-encode stored answer keys against the new question count
+        self._encoded_keys = {
+            version: encode_answers(answer_key, len(self._q2s))
+            for version, answer_key in self.answer_keys.items()
+        }
+    
     def set_answer_key(self, sheet_version: str, answer_key: Dict[str, str]):
         """Set answer key for a specific sheet version"""
         self.answer_keys[sheet_version] = answer_key
+        self._encoded_keys[sheet_version] = encode_answers(answer_key, len(self._q2s))
         self.logger.info(f"Answer key set for version {sheet_version}")
     
     def load_answer_keys(self, answer_keys_file: str):
@@ -40,6 +114,7 @@ class OMRProcessor:
         try:
             with open(answer_keys_file, 'r') as f:
                 self.answer_keys = json.load(f)
+            self._build_subject_tables()
             self.logger.info(f"Answer keys loaded from {answer_keys_file}")
         except Exception as e:
             self.logger.error(f"Error loading answer keys: {e}")
@@ -54,84 +129,179 @@ class OMRProcessor:
         # You can enhance this by detecting version markers in the image
         return "A"
     
+    def _write_image(self, path: Path, image: np.ndarray):
+        """Encode and save an image on the IO pool, returning the pending future"""
+        params = _IMWRITE_PARAMS.get(path.suffix.lower(), [])
+        return self._io_pool.submit(cv2.imwrite, str(path), image, params)
+    
+    @staticmethod
+    def _image_hash(image: np.ndarray) -> bytes:
+        """Content hash of an image, used as the detection cache key"""
+        digest = hashlib.blake2b(str(image.shape).encode(), digest_size=16)
+        digest.update(memoryview(np.ascontiguousarray(image)).cast("B"))
+        return digest.digest()
+    
+    def _memoize(self, cache: OrderedDict, key: bytes, compute):
+        """Return a copy of cache[key], computing and storing it (LRU bounded) on a miss"""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+        
+        if value is None:
+            # Computed outside the lock so other sheets are not held up
+            value = compute()
+            with self._cache_lock:
+                cache[key] = value
+                if len(cache) > IMAGE_CACHE_SIZE:
+                    cache.popitem(last=False)
+        
+        # Callers get their own copy so editing one result never changes another
+        return copy.deepcopy(value)
+    
+    def _get_encoded_key(self, sheet_version: Optional[str],
+                         correct_answers: Dict[str, str]) -> np.ndarray:
+        """Return the encoded answer key, using the one stored for the sheet version"""
+        total_questions = len(self._q2s)
+        if sheet_version is None or self.answer_keys.get(sheet_version) is not correct_answers:
+            return encode_answers(correct_answers, total_questions)
+        
+        key_codes = self._encoded_keys.get(sheet_version)
+        if key_codes is None:
+            key_codes = encode_answers(correct_answers, total_questions)
+            self._encoded_keys[sheet_version] = key_codes
+        return key_codes
+    
     def calculate_subject_scores(self, student_answers: Dict[str, str], 
-                               correct_answers: Dict[str, str]) -> Dict[str, Any]:
+                               correct_answers: Dict[str, str],
+                               sheet_version: Optional[str] = None) -> Dict[str, Any]:
         """Calculate subject-wise and total scores"""
-        scores = {
-            "subject_scores": {},
-            "total_score": 0,
-            "correct_answers": 0,
-            "total_questions": 0,
-            "subject_breakdown": {}
-        }
+        subjects = self.subject_config["subjects"]
         
+        # Compare letter codes for all questions at once; blank and multiple
+        # answers are encoded as non-letter codes so they never match
+        student_codes = encode_answers(student_answers, len(self._q2s), UNANSWERED_CODE)
+        key_codes = self._get_encoded_key(sheet_version, correct_answers)
+        
+        subject_correct, answered = score_sheet(student_codes, key_codes, self._q2s, len(subjects))
+        
+        return self._build_scores(subject_correct.tolist(), int(answered))
+    
+    def calculate_batch_subject_scores(self, batch_answers: List[Dict[str, str]],
+                                       sheet_versions: List[str]) -> List[Dict[str, Any]]:
+        """Calculate scores for many sheets at once using the bulk scoring kernel"""
+        if not batch_answers:
+            return []
+        
+        student_mat = np.stack([
+            encode_answers(answers, len(self._q2s), UNANSWERED_CODE) for answers in batch_answers
+        ])
+        key_mat = np.stack([
+            self._get_encoded_key(version, self.answer_keys[version]) for version in sheet_versions
+        ])
+        
+        subject_correct = bulk_score(student_mat, key_mat, self.subject_config["questions_per_subject"])
+        answered = ((student_mat != 0) & (key_mat != 0)).sum(axis=1)
+        
+        return [
+            self._build_scores(correct, total)
+            for correct, total in zip(subject_correct.tolist(), answered.tolist())
+        ]
+    
+    def _build_scores(self, subject_correct: List[int], total_questions: int) -> Dict[str, Any]:
+        """Build the scores dict from per-subject correct counts"""
         questions_per_subject = self.subject_config["questions_per_subject"]
         subjects = self.subject_config["subjects"]
         
-        # Initialize subject scores
-        for subject in subjects:
-            scores["subject_scores"][subject] = 0
-            scores["subject_breakdown"][subject] = {
-                "correct": 0,
-                "total": questions_per_subject,
-                "percentage": 0
-            }
-        
-        total_correct = 0
-        total_questions = 0
-        
-        # Calculate scores for each question
-        for question_key, student_answer in student_answers.items():
-            if question_key not in correct_answers:
-                continue
-            
-            # Extract question number
-            question_num = int(question_key.replace('Q', ''))
-            
-            # Determine subject (questions 1-20: subject 1, 21-40: subject 2, etc.)
-            subject_index = (question_num - 1) // questions_per_subject
-            if subject_index >= len(subjects):
-                continue
-            
-            subject = subjects[subject_index]
-            total_questions += 1
-            scores["subject_breakdown"][subject]["total"] = questions_per_subject
-            
-            # Check if answer is correct
-            correct_answer = correct_answers[question_key]
-            
-            # Handle multiple answers (flagged questions)
-            if isinstance(student_answer, list):
-                # If multiple answers, consider it incorrect
-                is_correct = False
-            elif student_answer is None:
-                # No answer provided
-                is_correct = False
-            else:
-                is_correct = student_answer.upper() == correct_answer.upper()
-            
-            if is_correct:
-                scores["subject_scores"][subject] += 1
-                scores["subject_breakdown"][subject]["correct"] += 1
-                total_correct += 1
+        scores = {
+            "subject_scores": {},
+            "total_score": 0,
+            "correct_answers": sum(subject_correct),
+            "total_questions": total_questions,
+            "subject_breakdown": {k: dict(v) for k, v in self._breakdown_template.items()}
+        }
         
-        # Calculate percentages and final scores
-        for subject in subjects:
+        total_scaled = 0.0
+        for subject, correct in zip(subjects, subject_correct):
             breakdown = scores["subject_breakdown"][subject]
-            if breakdown["total"] > 0:
-                breakdown["percentage"] = (breakdown["correct"] / breakdown["total"]) * 100
-                # Convert to 20-point scale
-                scores["subject_scores"][subject] = (breakdown["correct"] / breakdown["total"]) * 20
+            breakdown["correct"] = correct
+            breakdown["percentage"] = (correct / questions_per_subject) * 100
+            # Convert to 20-point scale
+            subject_score = (correct / questions_per_subject) * 20
+            scores["subject_scores"][subject] = subject_score
+            total_scaled += subject_score
         
-        scores["correct_answers"] = total_correct
-        scores["total_questions"] = total_questions
-        scores["total_score"] = sum(scores["subject_scores"].values())
+        scores["total_score"] = total_scaled
         
         return scores
     
+    def _overlay_shapes(self, bubble_results: Dict[str, Any]) -> Tuple[Dict[Tuple, List[np.ndarray]], List[Tuple]]:
+        """Bubble outline polygons grouped by (color, thickness), plus question labels"""
+        rows = bubble_results["grid_structure"]["rows"]
+        classifications = bubble_results["classifications"]
+        
+        question_num = 1
+        options_per_question = 4
+        
+        # Bubble outlines grouped by (color, thickness), drawn in one call per group
+        circles = {}
+        polygons = {}
+        labels = []
+        
+        for row in rows:
+            for i in range(0, len(row), options_per_question):
+                question_bubbles = row[i:i + options_per_question]
+                
+                if len(question_bubbles) < options_per_question:
+                    continue
+                
+                # Collect bubbles for this question
+                for j, bubble_info in enumerate(question_bubbles):
+                    bubble = bubble_info["bubble"]
+                    bubble_index = bubble_info["index"]
+                    
+                    # Determine color based on classification
+                    if bubble_index < len(classifications):
+                        is_filled = classifications[bubble_index]
+                        
+                        if is_filled:
+                            style = ((0, 255, 0), 3)  # Green for filled
+                        else:
+                            style = ((255, 0, 0), 1)  # Red for unfilled
+                    else:
+                        style = ((128, 128, 128), 1)  # Gray for unprocessed
+                    
+                    if len(bubble) == 3:  # Circular
+                        circles.setdefault(style, []).append(bubble)
+                    else:  # Rectangular
+                        x, y, w, h = bubble
+                        polygons.setdefault(style, []).append(
+                            np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.int32)
+                        )
+                
+                # Add question number label
+                if question_bubbles:
+                    first_bubble = question_bubbles[0]["bubble"]
+                    if len(first_bubble) == 3:
+                        label_x, label_y = first_bubble[0] - 30, first_bubble[1]
+                    else:
+                        label_x, label_y = first_bubble[0] - 30, first_bubble[1] + first_bubble[3] // 2
+                    
+                    label = QUESTION_KEYS[question_num - 1] if question_num <= len(QUESTION_KEYS) else f"Q{question_num}"
+                    labels.append((label, (int(label_x), int(label_y))))
+                
+                question_num += 1
+        
+        # Approximate circles with polygons so each style is a single polylines call
+        for style, style_circles in circles.items():
+            polygons.setdefault(style, []).extend(circle_polygons(np.array(style_circles)))
+        
+        return polygons, labels
+    
     def create_overlay_image(self, original_image: np.ndarray, 
                            bubble_results: Dict[str, Any],
-                           student_answers: Dict[str, str]) -> np.ndarray:
+                           student_answers: Dict[str, str],
+                           cache_key: Optional[bytes] = None) -> np.ndarray:
         """Create overlay image showing detected bubbles and answers"""
         # Convert to color if grayscale
         if len(original_image.shape) == 2:
@@ -143,58 +313,21 @@ class OMRProcessor:
             return overlay
         
         try:
-            rows = bubble_results["grid_structure"]["rows"]
-            classifications = bubble_results["classifications"]
+            # Geometry depends only on the detection results, so identical scans reuse it
+            if cache_key is None:
+                polygons, labels = self._overlay_shapes(bubble_results)
+            else:
+                polygons, labels = self._memoize(
+                    self._overlay_cache, cache_key,
+                    lambda: self._overlay_shapes(bubble_results)
+                )
             
-            question_num = 1
-            options_per_question = 4
+            for (color, thickness), style_polygons in polygons.items():
+                cv2.polylines(overlay, style_polygons, True, color, thickness)
             
-            for row in rows:
-                for i in range(0, len(row), options_per_question):
-                    question_bubbles = row[i:i + options_per_question]
-                    
-                    if len(question_bubbles) < options_per_question:
-                        continue
-                    
-                    # Draw bubbles for this question
-                    for j, bubble_info in enumerate(question_bubbles):
-                        bubble = bubble_info["bubble"]
-                        bubble_index = bubble_info["index"]
-                        
-                        # Determine color based on classification
-                        if bubble_index < len(classifications):
-                            is_filled = classifications[bubble_index]
-                            
-                            if is_filled:
-                                color = (0, 255, 0)  # Green for filled
-                                thickness = 3
-                            else:
-                                color = (255, 0, 0)  # Red for unfilled
-                                thickness = 1
-                        else:
-                            color = (128, 128, 128)  # Gray for unprocessed
-                            thickness = 1
-                        
-                        # Draw bubble outline
-                        if len(bubble) == 3:  # Circular
-                            x, y, r = bubble
-                            cv2.circle(overlay, (x, y), r, color, thickness)
-                        else:  # Rectangular
-                            x, y, w, h = bubble
-                            cv2.rectangle(overlay, (x, y), (x + w, y + h), color, thickness)
-                    
-                    # Add question number label
-                    if question_bubbles:
-                        first_bubble = question_bubbles[0]["bubble"]
-                        if len(first_bubble) == 3:
-                            label_x, label_y = first_bubble[0] - 30, first_bubble[1]
-                        else:
-                            label_x, label_y = first_bubble[0] - 30, first_bubble[1] + first_bubble[3] // 2
-                        
-                        cv2.putText(overlay, f"Q{question_num}", (label_x, label_y),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-                    
-                    question_num += 1
+            for label, position in labels:
+                cv2.putText(overlay, label, position,
+                          cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
             
             return overlay
             
@@ -203,8 +336,8 @@ class OMRProcessor:
             return overlay
     
     def process_omr_sheet(self, image_path: str, sheet_version: Optional[str] = None,
-                         student_id: Optional[str] = None) -> Dict[str, Any]:
-        """Complete OMR processing pipeline"""
+                         student_id: Optional[str] = None, score: bool = True) -> Dict[str, Any]:
+        """Complete OMR processing pipeline (score=False leaves scoring to the caller)"""
         results = {
             "success": False,
             "student_id": student_id,
@@ -224,27 +357,41 @@ class OMRProcessor:
             "error_message": None
         }
         
+        pending_writes = []
+        
         try:
             self.logger.info(f"Starting OMR processing for {image_path}")
             
             # Step 1: Image preprocessing
             self.logger.info("Step 1: Image preprocessing")
-            processed_image, processing_info = self.image_processor.preprocess_image(image_path)
+            processed_image, processing_info, original_image = self.image_processor.preprocess_image(
+                image_path, return_original=True
+            )
             results["processing_info"] = processing_info
             
             # Save processed image
-            processed_path = image_path.replace('.', '_processed.')
-            cv2.imwrite(processed_path, processed_image)
-            results["file_paths"]["processed"] = processed_path
+            source_path = Path(image_path)
+            processed_path = source_path.with_name(f"{source_path.stem}_processed{source_path.suffix}")
+            pending_writes.append((processed_path, self._write_image(processed_path, processed_image)))
+            results["file_paths"]["processed"] = str(processed_path)
+            
+            # Identical scans (re-uploads, reruns) reuse earlier detection results
+            image_key = self._image_hash(processed_image)
             
             # Step 2: Detect sheet version if not provided
             if sheet_version is None:
-                sheet_version = self.detect_sheet_version(processed_image)
+                sheet_version = self._memoize(
+                    self._version_cache, image_key,
+                    lambda: self.detect_sheet_version(processed_image)
+                )
                 results["sheet_version"] = sheet_version
             
             # Step 3: Bubble detection and classification
             self.logger.info("Step 2: Bubble detection and classification")
-            bubble_results = self.bubble_detector.detect_and_classify_bubbles(processed_image)
+            bubble_results = self._memoize(
+                self._bubble_cache, image_key,
+                lambda: self.bubble_detector.detect_and_classify_bubbles(processed_image)
+            )
             results["bubble_detection"] = bubble_results
             
             if bubble_results["bubbles_detected"] == 0:
@@ -260,42 +407,42 @@ class OMRProcessor:
             results["student_answers"] = answer_mapping["answers"]
             results["flagged_questions"] = answer_mapping["flagged_questions"]
             
-            # Step 5: Calculate scores
-            self.logger.info("Step 4: Calculating scores")
-            if sheet_version in self.answer_keys:
-                correct_answers = self.answer_keys[sheet_version]
-                scores = self.calculate_subject_scores(
-                    answer_mapping["answers"],
-                    correct_answers
-                )
-                results["scores"] = scores
-            else:
-                self.logger.warning(f"No answer key found for version {sheet_version}")
-                results["scores"] = {"error": f"No answer key for version {sheet_version}"}
+            # Step 5: Calculate scores (batch processing scores many sheets at once instead)
+            if score:
+                self.logger.info("Step 4: Calculating scores")
+                if sheet_version in self.answer_keys:
+                    correct_answers = self.answer_keys[sheet_version]
+                    scores = self.calculate_subject_scores(
+                        answer_mapping["answers"],
+                        correct_answers,
+                        sheet_version
+                    )
+                    results["scores"] = scores
+                else:
+                    self.logger.warning(f"No answer key found for version {sheet_version}")
+                    results["scores"] = {"error": f"No answer key for version {sheet_version}"}
             
-            # Step 6: Calculate confidence metrics
-            confidence_scores = bubble_results.get("confidence_scores", [])
-            if confidence_scores:
-                results["confidence_metrics"] = {
-                    "average_confidence": np.mean(confidence_scores),
-                    "min_confidence": np.min(confidence_scores),
-                    "max_confidence": np.max(confidence_scores),
-                    "low_confidence_count": len([c for c in confidence_scores if c < 0.7])
-                }
+            # Step 6: Confidence metrics (summarized during classification)
+            results["confidence_metrics"] = dict(bubble_results.get("confidence_summary", {}))
             
             # Step 7: Create overlay image
             self.logger.info("Step 5: Creating overlay image")
-            original_image = self.image_processor.load_image(image_path)
             overlay_image = self.create_overlay_image(
                 original_image,
                 bubble_results,
-                answer_mapping["answers"]
+                answer_mapping["answers"],
+                image_key
             )
             
             # Save overlay image
-            overlay_path = image_path.replace('.', '_overlay.')
-            cv2.imwrite(overlay_path, overlay_image)
-            results["file_paths"]["overlay"] = overlay_path
+            overlay_path = source_path.with_name(f"{source_path.stem}_overlay{source_path.suffix}")
+            pending_writes.append((overlay_path, self._write_image(overlay_path, overlay_image)))
+            results["file_paths"]["overlay"] = str(overlay_path)
+            
+            # Surface any failed image writes
+            for path, future in pending_writes:
+                if not future.result():
+                    raise IOError(f"Could not write image {path}")
             
             results["success"] = True
             self.logger.info("OMR processing completed successfully")
@@ -308,27 +455,84 @@ class OMRProcessor:
         
         return results
     
-    def batch_process_omr_sheets(self, image_paths: List[str], 
-                                sheet_versions: Optional[List[str]] = None,
-                                student_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Process multiple OMR sheets in batch"""
-        results = []
-        
+    def iter_process(self, image_paths: List[str],
+                     sheet_versions: Optional[List[str]] = None,
+                     student_ids: Optional[List[str]] = None,
+                     use_processes: bool = True,
+                     max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Process multiple OMR sheets in parallel, yielding each result in input order"""
+        jobs = []
         for i, image_path in enumerate(image_paths):
             sheet_version = sheet_versions[i] if sheet_versions and i < len(sheet_versions) else None
             student_id = student_ids[i] if student_ids and i < len(student_ids) else None
-            
-            self.logger.info(f"Processing sheet {i+1}/{len(image_paths)}: {image_path}")
-            
-            result = self.process_omr_sheet(image_path, sheet_version, student_id)
-            results.append(result)
+            jobs.append((image_path, sheet_version, student_id))
         
-        return results
+        if not jobs:
+            return
+        
+        self.logger.info(f"Processing {len(jobs)} sheets using {'processes' if use_processes else 'threads'}")
+        
+        if use_processes:
+            # Each worker builds its own processor once; OpenCV state does not pickle.
+            # Workers are spawned rather than forked: forking while the IO pool or
+            # server threads hold locks can deadlock the child
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.answer_keys, self.subject_config)
+            )
+            worker = _process_one
+        else:
+            # OpenCV releases the GIL, so threads can share this processor
+            executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+            worker = lambda job: self.process_omr_sheet(*job, score=False)
+        
+        with executor:
+            # map() yields results in submission order as they become available;
+            # they are scored a chunk at a time with the bulk kernel
+            batch = []
+            for result in executor.map(worker, jobs, chunksize=4):
+                batch.append(result)
+                if len(batch) == SCORE_BATCH_SIZE:
+                    yield from self._score_results(batch)
+                    batch = []
+            yield from self._score_results(batch)
+    
+    def _score_results(self, batch_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill in the scores of unscored processing results with one bulk scoring call"""
+        scorable = []
+        for result in batch_results:
+            if not result["success"]:
+                continue
+            sheet_version = result["sheet_version"]
+            if sheet_version in self.answer_keys:
+                scorable.append(result)
+            else:
+                self.logger.warning(f"No answer key found for version {sheet_version}")
+                result["scores"] = {"error": f"No answer key for version {sheet_version}"}
+        
+        batch_scores = self.calculate_batch_subject_scores(
+            [result["student_answers"] for result in scorable],
+            [result["sheet_version"] for result in scorable]
+        )
+        for result, scores in zip(scorable, batch_scores):
+            result["scores"] = scores
+        return batch_results
+    
+    def batch_process_omr_sheets(self, image_paths: List[str], 
+                                sheet_versions: Optional[List[str]] = None,
+                                student_ids: Optional[List[str]] = None,
+                                use_processes: bool = True,
+                                max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Process multiple OMR sheets in batch"""
+        return list(self.iter_process(image_paths, sheet_versions, student_ids,
+                                      use_processes, max_workers))
     
-    def generate_summary_report(self, batch_results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate summary report for batch processing"""
+    def generate_summary_report(self, batch_results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Generate summary report for batch processing, consuming results as a stream"""
         summary = {
-            "total_sheets": len(batch_results),
+            "total_sheets": 0,
             "successful_processing": 0,
             "failed_processing": 0,
             "average_score": 0,
@@ -338,31 +542,49 @@ class OMRProcessor:
             "confidence_summary": {}
         }
         
-        successful_results = [r for r in batch_results if r["success"]]
-        summary["successful_processing"] = len(successful_results)
-        summary["failed_processing"] = summary["total_sheets"] - summary["successful_processing"]
+        score_sum = 0.0
+        score_count = 0
+        issue_counts = Counter()
         
-        if successful_results:
-            # Calculate average score
-            total_scores = [r["scores"].get("total_score", 0) for r in successful_results 
-                          if "total_score" in r.get("scores", {})]
-            if total_scores:
-                summary["average_score"] = np.mean(total_scores)
-            
-            # Analyze common issues
-            all_flagged = []
-            for result in successful_results:
-                all_flagged.extend(result.get("flagged_questions", []))
+        for result in batch_results:
+            summary["total_sheets"] += 1
+            if not result["success"]:
+                continue
+            summary["successful_processing"] += 1
             
-            issue_counts = {}
-            for flag in all_flagged:
-                issue = flag.get("issue", "unknown")
-                issue_counts[issue] = issue_counts.get(issue, 0) + 1
+            scores = result.get("scores", {})
+            if "total_score" in scores:
+                score_sum += scores["total_score"]
+                score_count += 1
             
-            summary["common_issues"] = issue_counts
+            # Analyze common issues
+            issue_counts.update(flag.get("issue", "unknown") for flag in result.get("flagged_questions", []))
+        
+        summary["failed_processing"] = summary["total_sheets"] - summary["successful_processing"]
+        if score_count:
+            summary["average_score"] = score_sum / score_count
+        summary["common_issues"] = dict(issue_counts)
         
         return summary
 
+# Per-process processor used by batch_process_omr_sheets workers
+_worker_processor: Optional[OMRProcessor] = None
+
+
+def _init_worker(answer_keys: Dict[str, Dict[str, str]], subject_config: Dict[str, Any]):
+    """Build the worker's OMRProcessor once per process"""
+    global _worker_processor
+    _worker_processor = OMRProcessor()
+    _worker_processor.answer_keys = answer_keys
+    _worker_processor.subject_config = subject_config
+    _worker_processor._build_subject_tables()
+
+
+def _process_one(job: Tuple[str, Optional[str], Optional[str]]) -> Dict[str, Any]:
+    """Process a single (image_path, sheet_version, student_id) job in a worker"""
+    image_path, sheet_version, student_id = job
+    return _worker_processor.process_omr_sheet(image_path, sheet_version, student_id, score=False)
+
 
 if __name__ == "__main__":
     # Test the OMR processor
@@ -0,0 +1,125 @@
+"""
+Numeric scoring kernels for encoded OMR answers
+Uses Numba when it is installed and falls back to NumPy otherwise
+"""
+import numpy as np
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Code for questions a student left blank or answered more than once; answer
+# keys encode invalid entries as 0 instead, so the two can never match
+UNANSWERED_CODE = 1
+
+
+@lru_cache(maxsize=1024)
+def _question_index(question_key: Any) -> Optional[int]:
+    """Zero-based index for "Q12" (bubble mapping) and "12" (answer key) style keys"""
+    try:
+        return int(str(question_key).lstrip('Q')) - 1
+    except ValueError:
+        return None
+
+
+def encode_answers(answers: Mapping[str, Any], total_questions: int,
+                   unanswered_code: int = 0,
+                   questions: Optional[Iterable[str]] = None) -> np.ndarray:
+    """
+    Encode a question -> answer mapping as uint8 letter codes indexed by question - 1
+    
+    Single letters are stored as their uppercase ASCII code. Any other value is
+    stored as unanswered_code: pass UNANSWERED_CODE for student answers and
+    keep the default 0 for answer keys. Questions missing from the mapping
+    (or outside `questions`, when given) are 0.
+    """
+    codes = np.zeros(total_questions, dtype=np.uint8)
+    for question_key in (answers if questions is None else questions):
+        answer = answers[question_key]
+        question_index = _question_index(question_key)
+        if question_index is None or not 0 <= question_index < total_questions:
+            continue
+        if isinstance(answer, str) and len(answer) == 1 and answer.isascii() and answer.isalpha():
+            codes[question_index] = ord(answer.upper())
+        else:
+            codes[question_index] = unanswered_code
+    return codes
+
+
+def _score_numpy(student_ans: np.ndarray, key: np.ndarray, subj_idx: np.ndarray,
+                 n_subjects: int) -> Tuple[np.ndarray, int]:
+    """Per-subject correct counts and answered count for one sheet (reference implementation)"""
+    in_key = key != 0
+    answered = (student_ans != 0) & in_key
+    matches = (student_ans == key) & in_key
+    return np.bincount(subj_idx[matches], minlength=n_subjects), int(answered.sum())
+
+
+def _bulk_score_numpy(student_mat: np.ndarray, key_mat: np.ndarray,
+                      questions_per_subject: int) -> np.ndarray:
+    """Per-subject correct counts for a batch of sheets (reference implementation)"""
+    n_sheets, n_questions = student_mat.shape
+    matches = (student_mat == key_mat) & (key_mat != 0)
+    return matches.reshape(n_sheets, n_questions // questions_per_subject,
+                           questions_per_subject).sum(axis=2, dtype=np.int32)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _score_numba(student_ans, key, subj_idx, n_subjects):
+        """Per-subject correct counts and answered count for one sheet in a single loop"""
+        subject_totals = np.zeros(n_subjects, dtype=np.int64)
+        answered = 0
+        for i in range(key.shape[0]):
+            if key[i] == 0 or student_ans[i] == 0:
+                continue
+            answered += 1
+            if student_ans[i] == key[i]:
+                subject_totals[subj_idx[i]] += 1
+        return subject_totals, answered
+    
+    @njit(parallel=True, cache=True)
+    def _bulk_score_numba(student_mat, key_mat, out_subject, questions_per_subject):
+        """Per-subject correct counts for a batch of sheets, one sheet per thread"""
+        for i in prange(student_mat.shape[0]):
+            for q in range(student_mat.shape[1]):
+                if key_mat[i, q] != 0 and student_mat[i, q] == key_mat[i, q]:
+                    out_subject[i, q // questions_per_subject] += 1
+
+
+def score_sheet(student_ans: np.ndarray, key: np.ndarray, subj_idx: np.ndarray,
+                n_subjects: int) -> Tuple[np.ndarray, int]:
+    """
+    Score one encoded answer sheet
+    
+    student_ans and key are (n_questions,) uint8 answer codes (0 = not present),
+    subj_idx maps each question to its subject index. Returns the number of
+    correct answers per subject and the number of answered key questions.
+    """
+    if NUMBA_AVAILABLE:
+        return _score_numba(student_ans, key, subj_idx, n_subjects)
+    return _score_numpy(student_ans, key, subj_idx, n_subjects)
+
+
+def bulk_score(student_mat: np.ndarray, key_mat: np.ndarray,
+               questions_per_subject: int) -> np.ndarray:
+    """
+    Score a batch of encoded answer sheets
+
+    student_mat is (n_sheets, n_questions) uint8 answer codes; key_mat is either
+    one encoded key per sheet with the same shape or a single (n_questions,) key.
+    Returns an (n_sheets, n_subjects) int32 array of correct answers per subject.
+    """
+    key_mat = np.broadcast_to(key_mat, student_mat.shape)
+    if not NUMBA_AVAILABLE:
+        return _bulk_score_numpy(student_mat, key_mat, questions_per_subject)
+
+    n_subjects = student_mat.shape[1] // questions_per_subject
+    out_subject = np.zeros((student_mat.shape[0], n_subjects), dtype=np.int32)
+    _bulk_score_numba(student_mat, key_mat, out_subject, questions_per_subject)
+    return out_subject
@@ -3,14 +3,21 @@ Streamlit frontend for OMR Evaluation System
 Provides web interface for uploading, processing, and reviewing OMR sheets
 """
 import streamlit as st
+from streamlit_autorefresh import st_autorefresh
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import json
+import orjson
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import time
+from functools import lru_cache
 import os
 from PIL import Image
 import io
@@ -26,6 +33,58 @@ st.set_page_config(
 
 # API Configuration
 API_BASE_URL = "http://localhost:8000"
+REQUEST_TIMEOUT = (3, 30)  # (connect, read) seconds
+API_WORKERS = 8  # concurrent requests when fanning out GETs
+
+# One comma-separated manual answer key entry, e.g. "1:A" or " 2 : b"
+_KEY_RE = re.compile(r"\s*(\d+)\s*:\s*([A-Da-d])\s*")
+
+# Review choices for flagged results, default first
+REVIEW_DECISIONS = ["Pending", "Approve", "Manual Review"]
+
+# Processing queue fields shown in System Status, with their display names
+QUEUE_COLUMNS = {
+    "id": "Queue ID",
+    "exam_id": "Exam ID",
+    "status": "Status",
+    "created_at": "Created",
+    "started_at": "Started",
+    "completed_at": "Completed"
+}
+
+# Static Settings > About text, sent as a single markdown element
+ABOUT_MARKDOWN = """
+**Version:** 1.0.0
+
+**Description:** 
+Automated OMR (Optical Mark Recognition) Evaluation & Scoring System for educational institutions.
+
+**Features:**
+- Automated bubble detection and classification
+- Multi-version answer sheet support
+- Subject-wise scoring
+- Batch processing capabilities
+- Comprehensive reporting and analytics
+- Manual review workflow for flagged results
+
+**Technology Stack:**
+- Backend: FastAPI + Python
+- Frontend: Streamlit
+- Image Processing: OpenCV + NumPy
+- Database: SQLite/PostgreSQL
+- Machine Learning: TensorFlow/Scikit-learn
+
+**Developed for:** Innomatics Research Labs
+
+**System Requirements:**
+- Python 3.8+
+- 4GB RAM minimum
+- 10GB storage space
+- Modern web browser
+"""
+
+# Subject names in result column order (subject_1_score .. subject_5_score)
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Biology", "English"]
 
 # Custom CSS for better styling
 st.markdown("""
@@ -74,32 +133,97 @@ if 'processing_queue' not in st.session_state:
     st.session_state.processing_queue = []
 if 'refresh_interval' not in st.session_state:
     st.session_state.refresh_interval = 5
+if 'export_futures' not in st.session_state:
+    st.session_state.export_futures = {}
 
 # Helper functions
-def make_api_request(endpoint, method="GET", data=None, files=None):
+@st.cache_resource
+def get_api_session():
+    """Shared HTTP session so API calls reuse pooled keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def make_api_request(endpoint, method="GET", data=None, files=None, session=None):
     """Make API request with error handling"""
     try:
         url = f"{API_BASE_URL}{endpoint}"
         
-        if method == "GET":
-            response = requests.get(url)
-        elif method == "POST":
-            if files:
-                response = requests.post(url, data=data, files=files)
-            else:
-                response = requests.post(url, json=data)
-        elif method == "PUT":
-            response = requests.put(url, json=data)
-        elif method == "DELETE":
-            response = requests.delete(url)
+        # Multipart uploads send form data; everything else sends JSON
+        response = (session or get_api_session()).request(
+            method,
+            url,
+            json=None if files else data,
+            data=data if files else None,
+            files=files,
+            timeout=REQUEST_TIMEOUT
+        )
         
         if response.status_code == 200:
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": orjson.loads(response.content)}
         else:
             return {"success": False, "error": response.text}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@st.cache_resource
+def get_export_executor():
+    """Background pool for export requests so pages do not wait on them"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def make_api_requests(endpoints):
+    """Make several GET requests concurrently, returning responses in the same order"""
+    # Resolve the shared session here; worker threads have no Streamlit context
+    session = get_api_session()
+    with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+        return list(executor.map(lambda endpoint: make_api_request(endpoint, session=session), endpoints))
+
+@st.cache_data(ttl=30)
+def fetch_exams():
+    """Exam list, memoized for a short time across reruns and pages"""
+    return make_api_request("/exams/")
+
+@st.cache_data(ttl=15)
+def fetch_exam_stats(exam_ids):
+    """Statistics responses for a tuple of exam IDs, fetched concurrently and memoized"""
+    return make_api_requests([f"/exams/{exam_id}/statistics" for exam_id in exam_ids])
+
+@st.cache_data(ttl=5, show_spinner=False)
+def cached_get(endpoint):
+    """GET an idempotent endpoint, memoized briefly so reruns skip the round trip"""
+    return make_api_request(endpoint)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def cached_get_all(endpoints):
+    """GET a tuple of idempotent endpoints concurrently, memoized like cached_get"""
+    return make_api_requests(endpoints)
+
+def clear_api_cache():
+    """Drop memoized API data after changes or on request"""
+    fetch_exams.clear()
+    fetch_exam_stats.clear()
+    cached_get.clear()
+    cached_get_all.clear()
+
+@st.cache_data
+def results_to_csv(df):
+    """Encode a results table as CSV bytes for download"""
+    return df.to_csv(index=False).encode("utf-8")
+
+@st.cache_data
+def results_to_excel(df):
+    """Encode a results table as an Excel workbook for download"""
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False)
+    return buffer.getvalue()
+
 def display_message(message, message_type="info"):
     """Display styled message"""
     if message_type == "success":
@@ -111,8 +235,9 @@ def display_message(message, message_type="info"):
     else:
         st.info(message)
 
+@lru_cache(maxsize=8192)
 def format_datetime(dt_string):
-    """Format datetime string for display"""
+    """Format datetime string for display (memoized; the same timestamps recur across reruns)"""
     try:
         dt = datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
         return dt.strftime("%Y-%m-%d %H:%M:%S")
@@ -128,12 +253,19 @@ page = st.sidebar.selectbox(
     ["Dashboard", "Upload Files", "Manage Exams", "View Results", "Review Flagged", "System Status", "Settings"]
 )
 
+if st.sidebar.button("🔄 Refresh"):
+    clear_api_cache()
+
+# Auto-refresh is scheduled by the browser, so no server thread sleeps between reruns
+if page in ["Dashboard", "System Status"] and st.session_state.get('refresh_interval', 5) > 0:
+    st_autorefresh(interval=st.session_state.refresh_interval * 1000, key="autorefresh")
+
 # Main content based on selected page
 if page == "Dashboard":
     st.markdown('<h1 class="main-header">📊 Dashboard</h1>', unsafe_allow_html=True)
     
     # Get system statistics
-    health_response = make_api_request("/health")
+    health_response, queue_response = cached_get_all(("/health", "/processing/queue"))
     
     if health_response["success"]:
         col1, col2, col3, col4 = st.columns(4)
@@ -143,13 +275,12 @@ if page == "Dashboard":
         
         with col2:
             # Get total exams
-            exams_response = make_api_request("/exams/")
+            exams_response = fetch_exams()
             total_exams = len(exams_response["data"]) if exams_response["success"] else 0
             st.metric("Total Exams", total_exams)
         
         with col3:
             # Get processing queue status
-            queue_response = make_api_request("/processing/queue")
             queue_size = len(queue_response["data"]) if queue_response["success"] else 0
             st.metric("Processing Queue", queue_size)
         
@@ -162,15 +293,16 @@ if page == "Dashboard":
     st.subheader("📈 Recent Activity")
     
     # Get recent exams
-    exams_response = make_api_request("/exams/")
+    exams_response = fetch_exams()
     if exams_response["success"] and exams_response["data"]:
         recent_exams = sorted(exams_response["data"], 
                             key=lambda x: x["created_at"], reverse=True)[:5]
         
+        # Get exam statistics
+        stats_responses = fetch_exam_stats(tuple(exam["id"] for exam in recent_exams))
+        
         exam_data = []
-        for exam in recent_exams:
-            # Get exam statistics
-            stats_response = make_api_request(f"/exams/{exam['id']}/statistics")
+        for exam, stats_response in zip(recent_exams, stats_responses):
             if stats_response["success"]:
                 stats = stats_response["data"]
                 exam_data.append({
@@ -193,7 +325,7 @@ elif page == "Upload Files":
     st.markdown('<h1 class="main-header">📤 Upload OMR Sheets</h1>', unsafe_allow_html=True)
     
     # Get available exams
-    exams_response = make_api_request("/exams/")
+    exams_response = fetch_exams()
     
     if not exams_response["success"] or not exams_response["data"]:
         st.warning("No exams available. Please create an exam first.")
@@ -239,7 +371,8 @@ elif page == "Upload Files":
     if submit_button:
         if upload_type == "Single File" and uploaded_file:
             # Single file upload
-            files = {"file": uploaded_file.getvalue()}
+            # Pass the upload buffer itself with its real name and content type
+            files = {"file": (uploaded_file.name, uploaded_file, uploaded_file.type)}
             data = {
                 "exam_id": exam_id,
                 "student_id": student_id if student_id else None,
@@ -252,12 +385,13 @@ elif page == "Upload Files":
             if response["success"]:
                 display_message(f"✅ File uploaded successfully! Queue ID: {response['data']['queue_id']}", "success")
                 st.session_state.processing_queue.append(response['data']['queue_id'])
+                clear_api_cache()
             else:
                 display_message(f"❌ Upload failed: {response['error']}", "error")
         
         elif upload_type == "Batch Upload" and uploaded_files:
             # Batch upload
-            files = [("files", file.getvalue()) for file in uploaded_files]
+            files = [("files", (file.name, file, file.type)) for file in uploaded_files]
             data = {"exam_id": exam_id}
             
             with st.spinner(f"Uploading {len(uploaded_files)} files..."):
@@ -267,6 +401,7 @@ elif page == "Upload Files":
                 display_message(f"✅ {len(uploaded_files)} files uploaded successfully!", "success")
                 queue_ids = [file_info['queue_id'] for file_info in response['data']['files']]
                 st.session_state.processing_queue.extend(queue_ids)
+                clear_api_cache()
             else:
                 display_message(f"❌ Upload failed: {response['error']}", "error")
     
@@ -278,8 +413,10 @@ elif page == "Upload Files":
         status_container = st.container()
         
         with status_container:
-            for queue_id in st.session_state.processing_queue:
-                status_response = make_api_request(f"/processing/queue/{queue_id}")
+            queue_ids = list(st.session_state.processing_queue)
+            status_responses = make_api_requests([f"/processing/queue/{queue_id}" for queue_id in queue_ids])
+            
+            for queue_id, status_response in zip(queue_ids, status_responses):
                 if status_response["success"]:
                     status_data = status_response["data"]
                     status = status_data["status"]
@@ -349,7 +486,7 @@ elif page == "Manage Exams":
                     if uploaded_key:
                         # Process uploaded file
                         if uploaded_key.name.endswith('.json'):
-                            answer_keys[version] = json.load(uploaded_key)
+                            answer_keys[version] = orjson.loads(uploaded_key.read())
                         elif uploaded_key.name.endswith('.csv'):
                             df = pd.read_csv(uploaded_key)
                             if 'question' in df.columns and 'answer' in df.columns:
@@ -363,15 +500,23 @@ elif page == "Manage Exams":
                     )
                     
                     if answers_text:
-                        try:
-                            # Parse manual entry
-                            answers = {}
-                            for line in answers_text.split(','):
-                                if ':' in line:
-                                    q, a = line.strip().split(':')
-                                    answers[q.strip()] = a.strip().upper()
+                        # Parse manual entry, rejecting the whole key if any entry is malformed
+                        answers = {}
+                        invalid_entries = []
+                        for entry in answers_text.split(','):
+                            if not entry.strip():
+                                continue
+                            match = _KEY_RE.fullmatch(entry)
+                            if match:
+                                answers[match.group(1)] = match.group(2).upper()
+                            else:
+                                invalid_entries.append(entry.strip())
+                        
+                        if invalid_entries:
+                            st.error(f"Invalid entries for Version {version}: {', '.join(invalid_entries)}")
+                        elif answers:
                             answer_keys[version] = answers
-                        except:
+                        else:
                             st.error(f"Invalid format for Version {version}")
             
             submit_exam = st.form_submit_button("Create Exam")
@@ -394,6 +539,7 @@ elif page == "Manage Exams":
                 
                 if response["success"]:
                     display_message("✅ Exam created successfully!", "success")
+                    clear_api_cache()
                     st.rerun()
                 else:
                     display_message(f"❌ Failed to create exam: {response['error']}", "error")
@@ -403,10 +549,12 @@ elif page == "Manage Exams":
     with tab2:
         st.subheader("Existing Exams")
         
-        exams_response = make_api_request("/exams/")
+        exams_response = fetch_exams()
         
         if exams_response["success"] and exams_response["data"]:
-            for exam in exams_response["data"]:
+            stats_responses = fetch_exam_stats(tuple(exam["id"] for exam in exams_response["data"]))
+            
+            for exam, stats_response in zip(exams_response["data"], stats_responses):
                 with st.expander(f"📋 {exam['exam_name']} - {format_datetime(exam['exam_date'])}"):
                     col1, col2, col3 = st.columns(3)
                     
@@ -421,8 +569,6 @@ elif page == "Manage Exams":
                     with col3:
                         st.write(f"**Created:** {format_datetime(exam['created_at'])}")
                         
-                        # Get exam statistics
-                        stats_response = make_api_request(f"/exams/{exam['id']}/statistics")
                         if stats_response["success"]:
                             stats = stats_response["data"]
                             st.write(f"**Students Processed:** {stats.get('total_students', 0)}")
@@ -443,7 +589,7 @@ elif page == "View Results":
     st.markdown('<h1 class="main-header">📊 View Results</h1>', unsafe_allow_html=True)
     
     # Get available exams
-    exams_response = make_api_request("/exams/")
+    exams_response = fetch_exams()
     
     if not exams_response["success"] or not exams_response["data"]:
         st.warning("No exams available.")
@@ -465,11 +611,16 @@ elif page == "View Results":
         st.subheader("📈 Summary Statistics")
         
         total_students = len(results)
-        total_scores = [r["total_score"] for r in results]
-        avg_score = sum(total_scores) / len(total_scores) if total_scores else 0
-        max_score = max(total_scores) if total_scores else 0
-        min_score = min(total_scores) if total_scores else 0
-        pass_rate = len([s for s in total_scores if s >= 50]) / len(total_scores) * 100 if total_scores else 0
+        # Subject scores as one (students x subjects) array, shared by the chart and table
+        subject_scores = np.array(
+            [[r[f"subject_{i}_score"] for i in range(1, len(SUBJECTS) + 1)] for r in results],
+            dtype=np.float64
+        )
+        total_scores = np.fromiter((r["total_score"] for r in results), dtype=np.float64, count=total_students)
+        avg_score = float(total_scores.mean())
+        max_score = float(total_scores.max())
+        min_score = float(total_scores.min())
+        pass_rate = float((total_scores >= 50).mean() * 100)
         
         col1, col2, col3, col4, col5 = st.columns(5)
         
@@ -478,9 +629,9 @@ elif page == "View Results":
         with col2:
             st.metric("Average Score", f"{avg_score:.1f}")
         with col3:
-            st.metric("Highest Score", max_score)
+            st.metric("Highest Score", f"{max_score:g}")
         with col4:
-            st.metric("Lowest Score", min_score)
+            st.metric("Lowest Score", f"{min_score:g}")
         with col5:
             st.metric("Pass Rate", f"{pass_rate:.1f}%")
         
@@ -501,19 +652,8 @@ elif page == "View Results":
         
         with col2:
             # Subject-wise performance
-            subject_data = []
-            for result in results:
-                subject_data.append({
-                    "Mathematics": result["subject_1_score"],
-                    "Physics": result["subject_2_score"],
-                    "Chemistry": result["subject_3_score"],
-                    "Biology": result["subject_4_score"],
-                    "English": result["subject_5_score"]
-                })
-            
-            if subject_data:
-                df_subjects = pd.DataFrame(subject_data)
-                avg_subjects = df_subjects.mean()
+            if subject_scores.size:
+                avg_subjects = pd.Series(subject_scores.mean(axis=0), index=SUBJECTS)
                 
                 fig_subjects = px.bar(
                     x=avg_subjects.index,
@@ -526,25 +666,22 @@ elif page == "View Results":
         # Detailed results table
         st.subheader("📋 Detailed Results")
         
-        # Prepare data for table
-        table_data = []
-        for result in results:
-            table_data.append({
-                "Student ID": result["student"]["student_id"] if result["student"] else "Unknown",
-                "Student Name": result["student"]["name"] if result["student"] else "Unknown",
-                "Version": result["sheet_version"],
-                "Math": result["subject_1_score"],
-                "Physics": result["subject_2_score"],
-                "Chemistry": result["subject_3_score"],
-                "Biology": result["subject_4_score"],
-                "English": result["subject_5_score"],
-                "Total": result["total_score"],
-                "Status": result["processing_status"],
-                "Confidence": f"{result['confidence_score']:.2f}",
-                "Processed": format_datetime(result["processed_at"]) if result["processed_at"] else "N/A"
-            })
-        
-        df_results = pd.DataFrame(table_data)
+        # Build the table column by column
+        students = [r["student"] for r in results]
+        df_results = pd.DataFrame({
+            "Student ID": [s["student_id"] if s else "Unknown" for s in students],
+            "Student Name": [s["name"] if s else "Unknown" for s in students],
+            "Version": [r["sheet_version"] for r in results],
+            "Math": subject_scores[:, 0],
+            "Physics": subject_scores[:, 1],
+            "Chemistry": subject_scores[:, 2],
+            "Biology": subject_scores[:, 3],
+            "English": subject_scores[:, 4],
+            "Total": total_scores,
+            "Status": [r["processing_status"] for r in results],
+            "Confidence": [f"{r['confidence_score']:.2f}" for r in results],
+            "Processed": [format_datetime(r["processed_at"]) if r["processed_at"] else "N/A" for r in results]
+        })
         st.dataframe(df_results, use_container_width=True)
         
         # Export options
@@ -552,27 +689,37 @@ elif page == "View Results":
         
         col1, col2, col3 = st.columns(3)
         
+        # CSV and Excel are built from the table already on screen
         with col1:
-            if st.button("Export as CSV"):
-                response = make_api_request(f"/export/exam/{exam_id}/csv")
-                if response["success"]:
-                    st.success("CSV export initiated. Check downloads folder.")
-                else:
-                    st.error("Export failed.")
+            st.download_button(
+                "Export as CSV",
+                results_to_csv(df_results),
+                file_name=f"exam_{exam_id}_results.csv",
+                mime="text/csv"
+            )
         
         with col2:
-            if st.button("Export as Excel"):
-                response = make_api_request(f"/export/exam/{exam_id}/excel")
-                if response["success"]:
-                    st.success("Excel export initiated. Check downloads folder.")
-                else:
-                    st.error("Export failed.")
+            st.download_button(
+                "Export as Excel",
+                results_to_excel(df_results),
+                file_name=f"exam_{exam_id}_results.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
         
         with col3:
+            # The server-side export runs in the background; its status shows on later reruns
+            export_key = f"json_{exam_id}"
             if st.button("Export as JSON"):
-                response = make_api_request(f"/export/exam/{exam_id}/json")
-                if response["success"]:
-                    st.success("JSON export initiated. Check downloads folder.")
+                st.session_state.export_futures[export_key] = get_export_executor().submit(
+                    make_api_request, f"/export/exam/{exam_id}/json", session=get_api_session()
+                )
+            
+            export_future = st.session_state.export_futures.get(export_key)
+            if export_future is not None:
+                if not export_future.done():
+                    st.info("JSON export running...")
+                elif export_future.result()["success"]:
+                    st.success("JSON export completed. Check downloads folder.")
                 else:
                     st.error("Export failed.")
     
@@ -583,52 +730,55 @@ elif page == "Review Flagged":
     st.markdown('<h1 class="main-header">🚩 Review Flagged Results</h1>', unsafe_allow_html=True)
     
     # Get flagged results
-    flagged_response = make_api_request("/results/flagged")
+    flagged_response = cached_get("/results/flagged")
     
     if flagged_response["success"] and flagged_response["data"]:
         flagged_results = flagged_response["data"]
         
         st.write(f"Found {len(flagged_results)} results that need review.")
         
-        for result in flagged_results:
-            with st.expander(f"🚩 Student: {result['student']['name'] if result['student'] else 'Unknown'} - Score: {result['total_score']}"):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write("**Student Information:**")
-                    st.write(f"ID: {result['student']['student_id'] if result['student'] else 'Unknown'}")
-                    st.write(f"Name: {result['student']['name'] if result['student'] else 'Unknown'}")
-                    st.write(f"Sheet Version: {result['sheet_version']}")
-                    st.write(f"Confidence Score: {result['confidence_score']:.2f}")
-                
-                with col2:
-                    st.write("**Scores:**")
-                    st.write(f"Mathematics: {result['subject_1_score']}/20")
-                    st.write(f"Physics: {result['subject_2_score']}/20")
-                    st.write(f"Chemistry: {result['subject_3_score']}/20")
-                    st.write(f"Biology: {result['subject_4_score']}/20")
-                    st.write(f"English: {result['subject_5_score']}/20")
-                    st.write(f"**Total: {result['total_score']}/100**")
-                
-                if result["flagged_questions"]:
-                    st.write("**Flagged Questions:**")
-                    st.write(", ".join(result["flagged_questions"]))
-                
-                # Review actions
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    if st.button(f"Approve Result", key=f"approve_{result['id']}"):
-                        # Update result status
-                        st.success("Result approved!")
-                
-                with col2:
-                    if st.button(f"Request Manual Review", key=f"manual_{result['id']}"):
-                        st.info("Marked for manual review.")
-                
-                with col3:
-                    if st.button(f"View Original Image", key=f"image_{result['id']}"):
-                        st.info("Image viewing feature coming soon.")
+        # One editable table instead of a block of widgets per result
+        students = [r["student"] for r in flagged_results]
+        review_df = pd.DataFrame({
+            "Result ID": [r["id"] for r in flagged_results],
+            "Student ID": [s["student_id"] if s else "Unknown" for s in students],
+            "Student Name": [s["name"] if s else "Unknown" for s in students],
+            "Version": [r["sheet_version"] for r in flagged_results],
+            "Confidence": [r["confidence_score"] for r in flagged_results],
+            "Math": [r["subject_1_score"] for r in flagged_results],
+            "Physics": [r["subject_2_score"] for r in flagged_results],
+            "Chemistry": [r["subject_3_score"] for r in flagged_results],
+            "Biology": [r["subject_4_score"] for r in flagged_results],
+            "English": [r["subject_5_score"] for r in flagged_results],
+            "Total": [r["total_score"] for r in flagged_results],
+            "Flagged Questions": [", ".join(r["flagged_questions"] or []) for r in flagged_results],
+            "Decision": REVIEW_DECISIONS[0]
+        })
+        
+        # Edits are held client-side until the form is submitted, so choosing
+        # decisions does not rerun the page for every change
+        with st.form("review_form"):
+            edited_df = st.data_editor(
+                review_df,
+                column_config={
+                    "Confidence": st.column_config.NumberColumn(format="%.2f"),
+                    "Decision": st.column_config.SelectboxColumn(options=REVIEW_DECISIONS, required=True)
+                },
+                disabled=[column for column in review_df.columns if column != "Decision"],
+                hide_index=True,
+                use_container_width=True,
+                key="review_decisions"
+            )
+            
+            submitted = st.form_submit_button("Apply Decisions")
+        
+        # Review actions
+        if submitted:
+            decision_counts = edited_df["Decision"].value_counts()
+            st.success(
+                f"{decision_counts.get('Approve', 0)} result(s) approved, "
+                f"{decision_counts.get('Manual Review', 0)} marked for manual review."
+            )
     
     else:
         st.info("No flagged results found. All processed results look good!")
@@ -636,8 +786,8 @@ elif page == "Review Flagged":
 elif page == "System Status":
     st.markdown('<h1 class="main-header">⚙️ System Status</h1>', unsafe_allow_html=True)
     
-    # Health check
-    health_response = make_api_request("/health")
+    # Health check and queue status are fetched together
+    health_response, queue_response = cached_get_all(("/health", "/processing/queue"))
     
     if health_response["success"]:
         st.success("🟢 System is online and healthy")
@@ -650,17 +800,24 @@ elif page == "System Status":
     # Processing queue status
     st.subheader("🔄 Processing Queue")
     
-    queue_response = make_api_request("/processing/queue")
-    
     if queue_response["success"]:
         queue_data = queue_response["data"]
         
         if queue_data:
-            # Group by status
-            status_counts = {}
-            for item in queue_data:
-                status = item["status"]
-                status_counts[status] = status_counts.get(status, 0) + 1
+            # Reuse the derived counts and table while the queue is unchanged
+            queue_hash = hash(tuple(
+                (item["id"], item["status"], item["started_at"], item["completed_at"]) for item in queue_data
+            ))
+            queue_view = st.session_state.get("queue_view")
+            if queue_view is None or queue_view["hash"] != queue_hash:
+                queue_view = {
+                    "hash": queue_hash,
+                    # Group by status
+                    "status_counts": Counter(item["status"] for item in queue_data),
+                    "table": None
+                }
+                st.session_state.queue_view = queue_view
+            status_counts = queue_view["status_counts"]
             
             col1, col2, col3, col4 = st.columns(4)
             
@@ -675,18 +832,14 @@ elif page == "System Status":
             
             # Detailed queue view
             if st.checkbox("Show detailed queue"):
-                queue_df = pd.DataFrame([
-                    {
-                        "Queue ID": item["id"],
-                        "Exam ID": item["exam_id"],
-                        "Status": item["status"],
-                        "Created": format_datetime(item["created_at"]),
-                        "Started": format_datetime(item["started_at"]) if item["started_at"] else "N/A",
-                        "Completed": format_datetime(item["completed_at"]) if item["completed_at"] else "N/A"
-                    }
-                    for item in queue_data
-                ])
-                st.dataframe(queue_df, use_container_width=True)
+                if queue_view["table"] is None:
+                    queue_df = pd.json_normalize(queue_data)[list(QUEUE_COLUMNS)]
+                    for column in ["created_at", "started_at", "completed_at"]:
+                        queue_df[column] = pd.to_datetime(
+                            queue_df[column], format="ISO8601", errors="coerce"
+                        ).dt.strftime("%Y-%m-%d %H:%M:%S").fillna("N/A")
+                    queue_view["table"] = queue_df.rename(columns=QUEUE_COLUMNS)
+                st.dataframe(queue_view["table"], use_container_width=True)
         else:
             st.info("Processing queue is empty.")
     
@@ -747,41 +900,7 @@ elif page == "Settings":
     
     with tab3:
         st.subheader("About OMR Evaluation System")
-        
-        st.write("""
-        **Version:** 1.0.0
-        
-        **Description:** 
-        Automated OMR (Optical Mark Recognition) Evaluation & Scoring System for educational institutions.
-        
-        **Features:**
-        - Automated bubble detection and classification
-        - Multi-version answer sheet support
-        - Subject-wise scoring
-        - Batch processing capabilities
-        - Comprehensive reporting and analytics
-        - Manual review workflow for flagged results
-        
-        **Technology Stack:**
-        - Backend: FastAPI + Python
-        - Frontend: Streamlit
-        - Image Processing: OpenCV + NumPy
-        - Database: SQLite/PostgreSQL
-        - Machine Learning: TensorFlow/Scikit-learn
-        
-        **Developed for:** Innomatics Research Labs
-        """)
-        
-        st.write("**System Requirements:**")
-        st.write("- Python 3.8+")
-        st.write("- 4GB RAM minimum")
-        st.write("- 10GB storage space")
-        st.write("- Modern web browser")
-
-# Auto-refresh functionality
-if page in ["Dashboard", "System Status"] and st.session_state.get('refresh_interval', 5) > 0:
-    time.sleep(st.session_state.refresh_interval)
-    st.rerun()
+        st.markdown(ABOUT_MARKDOWN)
 
 # Footer
 st.markdown("---")